@@ -5,12 +5,17 @@ from kg_gen.steps._1_get_entities import get_entities
 from kg_gen.steps._2_get_relations import get_relations
 from kg_gen.steps._3_deduplicate import run_deduplication, DeduplicateMethod
 from kg_gen.utils.chunk_text import chunk_text
+from kg_gen.utils.embedding_cache import embedding_cache
 from kg_gen.utils.visualize_kg import visualize as visualize_kg
 from kg_gen.models import Graph
 import dspy
 import json
+import litellm
 import os
+import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from operator import itemgetter
 import networkx as nx
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -36,6 +41,8 @@ class KGGen:
         api_base: str = None,
         retrieval_model: Optional[str] = None,
         disable_cache: bool = False,
+        json_mode: bool = False,
+        num_retries: int = 3,
     ):
         """Initialize KGGen with optional model configuration
 
@@ -44,6 +51,10 @@ class KGGen:
             temperature: Temperature for model sampling
             api_key: API key for model access
             api_base: Specify the base URL endpoint for making API calls to a language model service
+            json_mode: Use dspy's JSONAdapter for extraction so the provider returns
+                structured JSON output instead of free text that has to be parsed
+            num_retries: Number of retries, with exponential backoff, for failed or
+                rate limited LM calls
         """
         self.model = model
         self.reasoning_effort = reasoning_effort
@@ -53,7 +64,10 @@ class KGGen:
         self.api_base = api_base
         self.retrieval_model: Optional[SentenceTransformer] = None
         self.lm = None
+        self._lm_config = None
         self.disable_cache = disable_cache
+        self.num_retries = num_retries
+        self.adapter = dspy.JSONAdapter() if json_mode else None
 
         self.init_model(
             model=model,
@@ -73,6 +87,22 @@ class KGGen:
         if "gpt-5" in self.model and max_tokens < 16000:
             raise ValueError("Max tokens must be 16000 for gpt-5 family models")
 
+    def _exceeds_context(self, text: str) -> bool:
+        """Whether text alone is more than the model accepts as input, if known."""
+        try:
+            max_input_tokens = litellm.get_model_info(self.model).get(
+                "max_input_tokens"
+            )
+        except Exception:
+            return False
+        if not max_input_tokens:
+            return False
+        # Tokens are at least one byte long, so only texts with more bytes than
+        # the limit can exceed it and need to be counted
+        if len(text) <= max_input_tokens and len(text.encode()) <= max_input_tokens:
+            return False
+        return litellm.token_counter(model=self.model, text=text) > max_input_tokens
+
     def init_model(
         self,
         model: str = None,
@@ -115,6 +145,21 @@ class KGGen:
         self.validate_temperature(self.temperature)
         self.validate_max_tokens(self.max_tokens)
 
+        # Keep the existing LM (and its history) when only the temperature changed
+        lm_config = (
+            self.model,
+            self.api_key,
+            self.api_base,
+            self.reasoning_effort,
+            self.max_tokens,
+            self.disable_cache,
+            self.num_retries,
+        )
+        if self.lm is not None and lm_config == self._lm_config:
+            self.lm.kwargs["temperature"] = self.temperature
+            return
+        self._lm_config = lm_config
+
         # Initialize dspy LM with current settings
         if self.api_key:
             self.lm = dspy.LM(
@@ -127,6 +172,7 @@ class KGGen:
                 max_tokens=self.max_tokens,
                 api_base=self.api_base,
                 cache=not self.disable_cache,
+                num_retries=self.num_retries,
                 model_type="responses" if self.model.startswith("openai/") else "chat",
             )
         else:
@@ -139,13 +185,14 @@ class KGGen:
                 if self.reasoning_effort
                 else None,
                 cache=not self.disable_cache,
+                num_retries=self.num_retries,
                 model_type="responses" if self.model.startswith("openai/") else "chat",
             )
 
     @staticmethod
     def from_file(file_path: str) -> Graph:
         with open(file_path, "r") as f:
-            graph = Graph(**json.load(f))
+            graph = Graph.model_validate_json(f.read())
         return graph
 
     @staticmethod
@@ -165,6 +212,7 @@ class KGGen:
         temperature: float = None,
         output_folder: Optional[str] = None,
         no_dspy: bool = False,
+        max_workers: Optional[int] = None,
     ) -> Graph:
         """Generate a knowledge graph from input text or messages.
 
@@ -175,6 +223,8 @@ class KGGen:
             chunk_size: Max size of text chunks in characters to process
             context: Description of data context
             output_folder: Path to save partial progress
+            max_workers: Max number of chunks processed concurrently. Defaults
+                to one worker per chunk, capped at 64.
 
         Returns:
             Graph: Generated knowledge graph
@@ -212,8 +262,12 @@ class KGGen:
                 reasoning_effort=reasoning_effort or self.reasoning_effort,
             )
 
+        # Only override the adapter in json mode, so one configured globally
+        # with dspy.configure(adapter=...) is kept otherwise
+        lm_context = {"adapter": self.adapter} if self.adapter else {}
+
         def _process(content, lm):
-            with dspy.context(lm=lm):
+            with dspy.context(lm=lm, **lm_context):
                 entities = get_entities(
                     content,
                     is_conversation,
@@ -224,6 +278,7 @@ class KGGen:
                     temperature=temperature
                     if temperature is not None
                     else self.temperature,
+                    cache=not self.disable_cache,
                 )
                 relations = get_relations(
                     content,
@@ -236,9 +291,17 @@ class KGGen:
                     temperature=temperature
                     if temperature is not None
                     else self.temperature,
+                    cache=not self.disable_cache,
                 )
                 return entities, relations
 
+        # Chunk upfront instead of waiting for a full size call to be rejected
+        if not chunk_size and self._exceeds_context(processed_input):
+            logger.warning(
+                f"Input exceeds the context window of {self.model}. Chunking text with chunk size 16384."
+            )
+            chunk_size = 16384
+
         if not chunk_size:
             try:
                 entities, relations = _process(processed_input, self.lm)
@@ -252,24 +315,34 @@ class KGGen:
                     raise e
 
         if chunk_size:
-            chunks = chunk_text(processed_input, chunk_size)
+            # Repeated chunks (boilerplate, headers) would only re-extract what the
+            # first copy already contributes to the merged sets
+            chunks = list(dict.fromkeys(chunk_text(processed_input, chunk_size)))
             entities = set()
             relations = set()
 
-            with ThreadPoolExecutor() as executor:
+            # Chunk processing is bound by LLM latency, not CPU, so size the
+            # pool by the number of chunks instead of the CPU-based default
+            with ThreadPoolExecutor(
+                max_workers=max_workers or min(len(chunks), 64) or 1
+            ) as executor:
                 future_to_chunk = {
                     executor.submit(_process, chunk, self.lm): chunk for chunk in chunks
                 }
 
                 for future in as_completed(future_to_chunk):
                     chunk_entities, chunk_relations = future.result()
-                    entities.update(chunk_entities)
-                    relations.update(chunk_relations)
+                    # The same entities come back from many chunks, intern them
+                    # so the merged sets and relation tuples share one object each
+                    entities.update(map(sys.intern, chunk_entities))
+                    relations.update(
+                        tuple(map(sys.intern, relation)) for relation in chunk_relations
+                    )
 
         graph = Graph(
             entities=entities,
             relations=relations,
-            edges={relation[1] for relation in relations},
+            edges=set(map(itemgetter(1), relations)),
         )
 
         if deduplication_method:
@@ -318,17 +391,13 @@ class KGGen:
         )
 
     def aggregate(self, graphs: list[Graph]) -> Graph:
-        # Initialize empty sets for combined graph
-        all_entities = set()
-        all_relations = set()
-        all_edges = set()
+        # Combine all graphs, each union runs in a single C-level call
+        all_entities = set().union(*(graph.entities for graph in graphs))
+        all_relations = set().union(*(graph.relations for graph in graphs))
+        all_edges = set().union(*(graph.edges for graph in graphs))
         all_entity_metadata: dict[str, set[str]] = {}
 
-        # Combine all graphs
         for graph in graphs:
-            all_entities.update(graph.entities)
-            all_relations.update(graph.relations)
-            all_edges.update(graph.edges)
             if graph.entity_metadata:
                 for entity, metadata_set in graph.entity_metadata.items():
                     if entity in all_entity_metadata:
@@ -379,12 +448,21 @@ class KGGen:
         if isinstance(graph, Graph):
             graph = self.to_nx(graph)
 
-        node_embeddings = {node: model.encode(node).tolist() for node in graph.nodes}
-        relation_embeddings = {
-            rel: model.encode(rel).tolist()
-            # TODO: this is triggering index out of range error
-            for rel in set(edge[2]["relation"] for edge in graph.edges(data=True))
-        }
+        nodes = list(graph.nodes)
+        # TODO: this is triggering index out of range error
+        relations = set(edge[2]["relation"] for edge in graph.edges(data=True))
+
+        # Embed each distinct string once, in a single batched call instead of
+        # one encode call per node and relation, skipping already cached ones
+        texts = list(dict.fromkeys(chain(nodes, relations)))
+        vectors = (
+            dict(zip(texts, embedding_cache(model).encode(model, texts).tolist()))
+            if texts
+            else {}
+        )
+
+        node_embeddings = {node: vectors[node] for node in nodes}
+        relation_embeddings = {rel: vectors[rel] for rel in relations}
         return node_embeddings, relation_embeddings
 
     def retrieve(
@@ -416,14 +494,23 @@ class KGGen:
         model: SentenceTransformer,
         k: int = 8,
     ) -> list[tuple[str, float]]:
+        if not node_embeddings or k <= 0:
+            return []
+        nodes = list(node_embeddings)
         query_embedding = model.encode(query).reshape(1, -1)
-        similarities = []
-        for node, embed in node_embeddings.items():
-            target_embedding = np.array(embed).reshape(1, -1)
-            similarity = cosine_similarity(query_embedding, target_embedding)[0][0]
-            similarities.append((node, similarity))
-        similarities = sorted(similarities, key=lambda x: x[1], reverse=True)
-        return similarities[:k]
+        # Score every node in one matrix product instead of one call per node
+        scores = cosine_similarity(
+            query_embedding, np.asarray(list(node_embeddings.values()))
+        )[0]
+        if k < len(nodes):
+            # Keep the k best plus any ties with the k-th, so the stable sort
+            # below gives the same nodes as sorting everything
+            kth = np.partition(scores, len(nodes) - k)[len(nodes) - k]
+            candidates = np.flatnonzero(scores >= kth)
+        else:
+            candidates = np.arange(len(nodes))
+        order = candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+        return [(nodes[i], scores[i]) for i in order]
 
     @staticmethod
     def retrieve_context(node: str, graph: nx.DiGraph, depth: int = 2) -> list[str]:
@@ -1,6 +1,9 @@
-import json
+from itertools import chain
+from operator import itemgetter
+import sys
 from pydantic import BaseModel, Field
 from typing import Any, Tuple, Optional
+import numpy as np
 
 
 # ~~~ DATA STRUCTURES ~~~
@@ -23,18 +26,26 @@ class Graph(BaseModel):
         Load the graph from a file.
         Fix graph entities and edges for missing ones defined in relations.
         """
+        # Parse and validate in one step with pydantic-core's JSON parser
         with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            graph = Graph.model_validate(data)
+            graph = Graph.model_validate_json(f.read())
+
+        # pydantic-core only reuses parsed strings of up to 64 characters, so
+        # longer names (descriptive entities, long predicates) get a new string
+        # for every occurrence. Intern them to share one object between the
+        # entities, edges and relations.
+        intern = sys.intern
+        graph.relations = {
+            (intern(s), intern(p), intern(o)) for s, p, o in graph.relations
+        }
+        graph.entities = set(map(intern, graph.entities))
+        graph.edges = set(map(intern, graph.edges))
 
         # Fix graph entities and edges
-        for relation in graph.relations:
-            if relation[0] not in graph.entities:
-                graph.entities.add(relation[0])
-            if relation[1] not in graph.edges:
-                graph.edges.add(relation[1])
-            if relation[2] not in graph.entities:
-                graph.entities.add(relation[2])
+        for s, p, o in graph.relations:
+            graph.entities.add(s)
+            graph.edges.add(p)
+            graph.entities.add(o)
 
         return graph
 
@@ -45,6 +56,30 @@ class Graph(BaseModel):
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(self.model_dump_json(indent=2))
 
+    def to_id_arrays(self) -> tuple[list[str], list[str], np.ndarray]:
+        """
+        Dense integer view of the graph: the sorted entity and edge names, and the
+        sorted relations as an (n_relations, 3) int32 array of (subject, predicate,
+        object) indices into them. Relation endpoints missing from the entities or
+        edges are given ids as well.
+        """
+        relations = sorted(self.relations)
+        entity_names = sorted(
+            self.entities.union(chain.from_iterable((s, o) for s, _, o in relations))
+        )
+        edge_names = sorted(self.edges.union(map(itemgetter(1), relations)))
+        entity_ids = {name: i for i, name in enumerate(entity_names)}
+        edge_ids = {name: i for i, name in enumerate(edge_names)}
+
+        relation_ids = np.fromiter(
+            chain.from_iterable(
+                (entity_ids[s], edge_ids[p], entity_ids[o]) for s, p, o in relations
+            ),
+            dtype=np.int32,
+            count=3 * len(relations),
+        ).reshape(-1, 3)
+        return entity_names, edge_names, relation_ids
+
     def stats(self, name: Optional[str] = None):
         """
         Print the stats of the graph.
@@ -1,9 +1,11 @@
 from typing import List, Optional
+from functools import lru_cache
 from pathlib import Path
 import dspy
-import litellm
 from pydantic import BaseModel
 
+from kg_gen.utils.response_cache import parsed_response
+
 
 class TextEntities(dspy.Signature):
     """Extract key entities from the source text. Extracted entities are subjects or objects.
@@ -28,6 +30,7 @@ class EntitiesResponse(BaseModel):
     entities: List[str]
 
 
+@lru_cache(maxsize=None)
 def _load_entities_prompt() -> str:
     """Load the entities prompt template from file."""
     prompt_path = Path(__file__).parent.parent / "prompts" / "entities.txt"
@@ -40,6 +43,7 @@ def _get_entities_litellm(
     api_key: Optional[str] = None,
     api_base: Optional[str] = None,
     temperature: float = 0.0,
+    cache: bool = True,
 ) -> List[str]:
     prompt_template = _load_entities_prompt()
     user_prompt = f"""
@@ -76,10 +80,12 @@ Here is the text to extract entities from:
     if api_base:
         kwargs["api_base"] = api_base
 
-    response = litellm.responses(**kwargs)
-    # print(response.model_dump_json(indent=2))
-    parsed = EntitiesResponse.model_validate_json(response.output[-1].content[0].text)
-    return parsed.entities
+    # Invalid responses raise and are not cached
+    return parsed_response(
+        kwargs,
+        lambda text: EntitiesResponse.model_validate_json(text).entities,
+        cache=cache,
+    )
 
 
 def get_entities(
@@ -90,6 +96,7 @@ def get_entities(
     api_key: Optional[str] = None,
     api_base: Optional[str] = None,
     temperature: float = 0.0,
+    cache: bool = True,
 ) -> List[str]:
     if use_litellm_prompt and not is_conversation:
         return _get_entities_litellm(
@@ -98,6 +105,7 @@ def get_entities(
             api_key=api_key,
             api_base=api_base,
             temperature=temperature,
+            cache=cache,
         )
 
     extract = (
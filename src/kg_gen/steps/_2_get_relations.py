@@ -1,10 +1,82 @@
-from typing import List, Tuple, Optional, Literal, Type
+from typing import Any, Iterator, List, Tuple, Optional, Literal, Type
+from functools import lru_cache
 from pathlib import Path
 import json
 import dspy
-import litellm
 from pydantic import BaseModel, create_model, ValidationError
 
+from kg_gen.utils.response_cache import parsed_response
+
+
+def _balanced_spans(text: str) -> list[Tuple[int, int]]:
+    """
+    (start, end) of every balanced JSON-like {...} or [...] span in text, ordered
+    by start. Found in a single linear scan that skips over string literals;
+    brackets still open at a mismatched closing bracket or at the end of the
+    text start no span. JSON strings cannot contain raw newlines, so a newline
+    ends a stray quote from the surrounding prose.
+    """
+    closing = {"{": "}", "[": "]"}
+    spans = []
+    # (expected closing bracket, start) of the open brackets
+    stack = []
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"' or char == "\n":
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in closing:
+            stack.append((closing[char], i))
+        elif char == "}" or char == "]":
+            if stack and stack[-1][0] == char:
+                spans.append((stack.pop()[1], i + 1))
+            else:
+                stack.clear()
+    spans.sort()
+    return spans
+
+
+def _embedded_json(text: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield each balanced JSON object or array embedded in text that parses, with
+    its parsed value, in order. Used when the model wraps its JSON in prose or
+    code fences; brackets in the prose that are unbalanced or not JSON (e.g.
+    "(see {notes})") are skipped.
+    """
+    resume = 0
+    for start, end in _balanced_spans(text):
+        if start < resume:
+            continue
+        span = text[start:end]
+        try:
+            value = json.loads(span)
+        except (json.JSONDecodeError, RecursionError):
+            continue
+        yield span, value
+        resume = end
+
+
+def _extract_json(text: str) -> Optional[str]:
+    """
+    Return the first balanced JSON object or array embedded in text that parses.
+    """
+    return next((span for span, _ in _embedded_json(text)), None)
+
+
+def _looks_like_relations(data: Any) -> bool:
+    """Whether recovered JSON can be a relations payload rather than e.g. "[1]"."""
+    items = data.get("relations") if isinstance(data, dict) else data
+    return isinstance(items, list) and (
+        not items or any(isinstance(item, dict) for item in items)
+    )
+
 
 def parse_relations_response(
     raw_json: str,
@@ -26,6 +98,21 @@ def parse_relations_response(
     Returns:
         List of (subject, predicate, object) tuples with valid entities
     """
+    try:
+        return _relations_from_response(raw_json, entities, response_model)
+    except ValueError:
+        return []
+
+
+def _relations_from_response(
+    raw_json: str,
+    entities: List[str],
+    response_model: Optional[Type[BaseModel]] = None,
+) -> List[Tuple[str, str, str]]:
+    """
+    parse_relations_response, raising ValueError when no relations list can be
+    recovered from the response instead of returning an empty list.
+    """
     entities_set = set(entities)
 
     # Try strict Pydantic validation first if model provided
@@ -39,14 +126,25 @@ def parse_relations_response(
     # Fallback: parse as raw JSON and filter
     try:
         data = json.loads(raw_json)
-    except json.JSONDecodeError:
-        return []
+    except (json.JSONDecodeError, RecursionError):
+        # The JSON may be surrounded by other text, try to recover it, skipping
+        # bracketed prose before the payload such as citations
+        data = next(
+            (
+                value
+                for _, value in _embedded_json(raw_json)
+                if _looks_like_relations(value)
+            ),
+            None,
+        )
+        if data is None:
+            raise ValueError("No JSON found in the relations response")
 
     # Handle both {"relations": [...]} and direct list formats
     items = data.get("relations", data) if isinstance(data, dict) else data
 
     if not isinstance(items, list):
-        return []
+        raise ValueError("The relations response has no list of relations")
 
     relations = []
     for item in items:
@@ -70,6 +168,7 @@ def parse_relations_response(
     return relations
 
 
+@lru_cache(maxsize=None)
 def _load_relations_prompt() -> str:
     """Load the relations prompt template from file."""
     prompt_path = Path(__file__).parent.parent / "prompts" / "relations.txt"
@@ -105,6 +204,7 @@ def _get_relations_litellm(
     api_key: Optional[str] = None,
     api_base: Optional[str] = None,
     temperature: float = 0.0,
+    cache: bool = True,
 ) -> List[Tuple[str, str, str]]:
     prompt_template = _load_relations_prompt()
     entities_str = "\n".join(f"- {e}" for e in entities)
@@ -156,9 +256,17 @@ Here is the source text to analyze:
     if api_base:
         kwargs["api_base"] = api_base
 
-    response = litellm.responses(**kwargs)
-    raw_json = response.output[-1].content[0].text
-    return parse_relations_response(raw_json, entities, RelationsResponse)
+    # Responses no relations can be recovered from are not cached
+    try:
+        return parsed_response(
+            kwargs,
+            lambda raw_json: _relations_from_response(
+                raw_json, entities, RelationsResponse
+            ),
+            cache=cache,
+        )
+    except ValueError:
+        return []
 
 
 def extraction_sig(
@@ -197,6 +305,20 @@ def extraction_sig(
         return ExtractConversationRelations
 
 
+class Relation(BaseModel):
+    """Knowledge graph subject-predicate-object tuple."""
+
+    subject: str = dspy.InputField(desc="Subject entity", examples=["Kevin"])
+    predicate: str = dspy.InputField(desc="Predicate", examples=["is brother of"])
+    object: str = dspy.InputField(desc="Object entity", examples=["Vicky"])
+
+
+@lru_cache(maxsize=None)
+def _relations_sig(is_conversation: bool, context: str = "") -> dspy.Signature:
+    """Extraction signature for the Relation model, built once per kind and context."""
+    return extraction_sig(Relation, is_conversation, context)
+
+
 def fallback_extraction_sig(
     entities, is_conversation, context: str = ""
 ) -> dspy.Signature:
@@ -230,6 +352,7 @@ def get_relations(
     api_key: Optional[str] = None,
     api_base: Optional[str] = None,
     temperature: float = 0.0,
+    cache: bool = True,
 ) -> List[Tuple[str, str, str]]:
     # Filter out entities containing backslashes
     entities = _filter_entities(entities)
@@ -242,16 +365,10 @@ def get_relations(
             api_key=api_key,
             api_base=api_base,
             temperature=temperature,
+            cache=cache,
         )
 
-    class Relation(BaseModel):
-        """Knowledge graph subject-predicate-object tuple."""
-
-        subject: str = dspy.InputField(desc="Subject entity", examples=["Kevin"])
-        predicate: str = dspy.InputField(desc="Predicate", examples=["is brother of"])
-        object: str = dspy.InputField(desc="Object entity", examples=["Vicky"])
-
-    ExtractRelations = extraction_sig(Relation, is_conversation, context)
+    ExtractRelations = _relations_sig(is_conversation, context)
 
     try:
         extract = dspy.Predict(ExtractRelations)
@@ -274,14 +391,27 @@ def get_relations(
             relations: list[Relation] = dspy.InputField()
             fixed_relations: list[Relation] = dspy.OutputField()
 
-        fix = dspy.ChainOfThought(FixedRelations)
-
-        fix_res = fix(
-            source_text=input_data, entities=entities, relations=result.relations
-        )
-
+        # Only relations whose subject or object is not an entity need fixing,
+        # skip the extra LM call entirely when there are none
+        entities_set = set(entities)
         good_relations = []
-        for rel in fix_res.fixed_relations:
-            if rel.subject in entities and rel.object in entities:
+        invalid_relations = []
+        for rel in result.relations:
+            if rel.subject in entities_set and rel.object in entities_set:
                 good_relations.append(rel)
+            else:
+                invalid_relations.append(rel)
+
+        if invalid_relations:
+            fix = dspy.ChainOfThought(FixedRelations)
+
+            fix_res = fix(
+                source_text=input_data,
+                entities=entities,
+                relations=invalid_relations,
+            )
+
+            for rel in fix_res.fixed_relations:
+                if rel.subject in entities_set and rel.object in entities_set:
+                    good_relations.append(rel)
         return [(r.subject, r.predicate, r.object) for r in good_relations]
@@ -14,30 +14,66 @@ class DeduplicateMethod(enum.Enum):
     FULL = "full"  # Deduplicate using both semantic hashing and KNN clustering + Intra cluster LM deduplication
 
 
+def _semhash_deduplication(
+    lm: dspy.LM,
+    graph: Graph,
+    retrieval_model: SentenceTransformer | None,
+    semhash_similarity_threshold: float,
+) -> Graph:
+    return run_semhash_deduplication(graph, semhash_similarity_threshold)
+
+
+def _lm_based_deduplication(
+    lm: dspy.LM,
+    graph: Graph,
+    retrieval_model: SentenceTransformer | None,
+    semhash_similarity_threshold: float,
+) -> Graph:
+    llm_deduplicate = LLMDeduplicate(retrieval_model, lm, graph)
+    llm_deduplicate.cluster()
+    return llm_deduplicate.deduplicate()
+
+
+def _full_deduplication(
+    lm: dspy.LM,
+    graph: Graph,
+    retrieval_model: SentenceTransformer | None,
+    semhash_similarity_threshold: float,
+) -> Graph:
+    deduplicated_graph = _semhash_deduplication(
+        lm, graph, retrieval_model, semhash_similarity_threshold
+    )
+    return _lm_based_deduplication(
+        lm, deduplicated_graph, retrieval_model, semhash_similarity_threshold
+    )
+
+
+# Handlers by method, also reachable by the method's value (e.g. "semhash")
+_DEDUPLICATION_HANDLERS = {
+    DeduplicateMethod.SEMHASH: _semhash_deduplication,
+    DeduplicateMethod.LM_BASED: _lm_based_deduplication,
+    DeduplicateMethod.FULL: _full_deduplication,
+}
+_DEDUPLICATION_HANDLERS.update(
+    {method.value: handler for method, handler in _DEDUPLICATION_HANDLERS.items()}
+)
+
+
 def run_deduplication(
     lm: dspy.LM,
     graph: Graph,
-    method: DeduplicateMethod = DeduplicateMethod.FULL,
+    method: DeduplicateMethod | str = DeduplicateMethod.FULL,
     retrieval_model: SentenceTransformer | None = None,
     semhash_similarity_threshold: float = 0.95,
 ) -> Graph:
-    if method != DeduplicateMethod.SEMHASH and retrieval_model is None:
+    handler = _DEDUPLICATION_HANDLERS.get(method)
+    if handler is None:
+        raise ValueError(f"Unknown deduplication method: {method}")
+
+    if handler is not _semhash_deduplication and retrieval_model is None:
         raise ValueError("No retrieval model provided")
 
-    if method == DeduplicateMethod.SEMHASH:
-        deduplicated_graph = run_semhash_deduplication(
-            graph, semhash_similarity_threshold
-        )
-    elif method == DeduplicateMethod.LM_BASED:
-        llm_deduplicate = LLMDeduplicate(retrieval_model, lm, graph)
-        llm_deduplicate.cluster()
-        deduplicated_graph = llm_deduplicate.deduplicate()
-    elif method == DeduplicateMethod.FULL:
-        deduplicated_graph = run_semhash_deduplication(
-            graph, semhash_similarity_threshold
-        )
-        llm_deduplicate = LLMDeduplicate(retrieval_model, lm, deduplicated_graph)
-        llm_deduplicate.cluster()
-        deduplicated_graph = llm_deduplicate.deduplicate()
-
-    return deduplicated_graph
+    if not graph.entities and not graph.edges and not graph.relations:
+        return graph
+
+    return handler(lm, graph, retrieval_model, semhash_similarity_threshold)
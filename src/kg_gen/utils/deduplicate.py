@@ -1,14 +1,75 @@
+import sys
 import unicodedata
+from functools import lru_cache
+from typing import NamedTuple, Optional
 from kg_gen.models import Graph
 from semhash import SemHash
 import inflect
 
+# Shared across DeduplicateList instances so the token cache below can be reused
+# between the entity and edge passes (and between graphs)
+_inflect_engine = inflect.engine()
+
+
+@lru_cache(maxsize=65536)
+def _singular_token(token: str) -> str:
+    """
+    Singular form of a token, or the token itself if it is not a plural noun.
+    """
+    sing = _inflect_engine.singular_noun(token)
+    return sing if isinstance(sing, str) and sing else token
+
+
+def _duplicated_record(duplicate) -> Optional[str]:
+    """
+    The record a SemHash duplicate record was found to duplicate, if any.
+    """
+    # Check if duplicates list is not empty before accessing
+    if (
+        duplicate.duplicates
+        and len(duplicate.duplicates) > 0
+        and len(duplicate.duplicates[0]) > 0
+    ):
+        return duplicate.duplicates[0][0]
+    return None
+
+
+class _SelfDeduplication(NamedTuple):
+    selected: tuple[str, ...]
+    duplicate_count: int
+    # (duplicate record, record it duplicates) pairs
+    duplicate_pairs: tuple[tuple[str, str], ...]
+
+
+@lru_cache(maxsize=8)
+def _self_deduplicate(records: tuple[str, ...], threshold: float) -> _SelfDeduplication:
+    """
+    SemHash self deduplication of the records, which embeds every record.
+    Repeated calls on the same records (e.g. deduplicating a graph again
+    after a small edit leaves the edges unchanged) reuse the result. Only the
+    outcome is kept, not the SemHash result holding the records' embeddings.
+    """
+    semhash = SemHash.from_records(records=list(records))
+    result = semhash.self_deduplicate(threshold=threshold)
+    duplicate_pairs = []
+    for duplicate in result.duplicates:
+        duplicate_value = _duplicated_record(duplicate)
+        if duplicate_value is not None:
+            duplicate_pairs.append((duplicate.record, duplicate_value))
+    return _SelfDeduplication(
+        tuple(result.selected), len(result.duplicates), tuple(duplicate_pairs)
+    )
+
+
+def clear_deduplication_cache() -> None:
+    """Forget the SemHash results kept for repeated deduplication calls."""
+    _self_deduplicate.cache_clear()
+
 
 class DeduplicateList:
     inflect_engine: inflect.engine
     original_map: dict[str, str]
     items_map: dict[str, str]
-    duplicates: dict[str, str]
     deduplicated: list[str]
 
     # Stats values
@@ -19,28 +80,47 @@ class DeduplicateList:
 
     def __init__(self, threshold: float = 0.95):
         self.threshold = threshold
-        self.inflect_engine = inflect.engine()
+        self.inflect_engine = _inflect_engine
         self.original_map = {}
         self.items_map = {}
-        self.duplicates = {}
         self.deduplicated = []
+        # Duplicate pairs of each deduplicate call, the duplicates map is only
+        # built from them when it is read
+        self._duplicate_pairs = []
+        self._duplicates = None
+
+    @property
+    def duplicates(self) -> dict[str, str]:
+        """
+        Map each duplicate normalized item to the item it duplicates.
+        """
+        if self._duplicates is None:
+            duplicates = {}
+            for pairs in self._duplicate_pairs:
+                for original, duplicate_value in pairs:
+                    duplicates.setdefault(original, duplicate_value)
+            self._duplicates = duplicates
+        return self._duplicates
 
     def normalize(self, text: str) -> str:
         """
         Normalize a text.
         """
+        # ASCII is already NFKC normalized, str.isascii() is O(1) in CPython
+        if text.isascii():
+            return text
         return unicodedata.normalize("NFKC", text)
 
     def singularize(self, text: str) -> str:
         """
         Singularize a text.
         """
-        # singularize each token when it looks like a plural noun
-        tokens = []
-        for tok in text.split():
-            sing = self.inflect_engine.singular_noun(tok)
-            tokens.append(sing if isinstance(sing, str) and sing else tok)
-        return " ".join(tokens).strip()
+        # Single words (the common case for entities and edges) need no split/join
+        if text.isalpha():
+            return _singular_token(text)
+        # singularize each token when it looks like a plural noun; tokens repeat
+        # heavily across entities ("of", "University", ...) so lookups are cached
+        return " ".join(map(_singular_token, text.split())).strip()
 
     def deduplicate(self, items: list[str]) -> list[str]:
         """
@@ -55,39 +135,62 @@ class DeduplicateList:
         """
         self.total_items = len(items)
 
-        # Normalize and singularize each string
-        normalized_items = set()
-        for item in items:
-            normalized = self.normalize(item)
-            singular = self.singularize(normalized)
-            self.original_map[item] = singular
-            self.items_map[singular] = item
-            normalized_items.add(singular)
+        # Items usually arrive as a set, sort them so the representative of each
+        # normalized form (the first item seen) does not depend on hash order
+        sorted_items = sorted(items)
+        # Normalize and singularize every string in one pass
+        singulars = list(map(self.singularize, map(self.normalize, sorted_items)))
+        self.original_map.update(zip(sorted_items, singulars))
+
+        # The keys of normalized_items are the distinct normalized strings, in
+        # order of first occurrence, so no separate set is needed. When no two
+        # items normalize alike (e.g. an already deduplicated graph) building
+        # the dict in one call gives the same result, otherwise the first item
+        # of each normalized form has to be kept explicitly.
+        normalized_items: dict[str, str] = dict(zip(singulars, sorted_items))
+        if len(normalized_items) < len(sorted_items):
+            normalized_items = {}
+            for item, singular in zip(sorted_items, singulars):
+                normalized_items.setdefault(singular, item)
+        self.items_map.update(normalized_items)
+
+        # Nothing for SemHash to compare with fewer than two distinct strings
+        if len(normalized_items) < 2:
+            self.deduplicated_items = len(normalized_items)
+            self.duplicate_items = 0
+            self.reduction = 0.0
+            self.deduplicated = list(normalized_items)
+            return
 
         # Deduplicate the normalized strings
-        semhash = SemHash.from_records(records=list(normalized_items))
-        deduplication_result = semhash.self_deduplicate(threshold=self.threshold)
+        deduplication_result = _self_deduplicate(
+            tuple(normalized_items), self.threshold
+        )
 
         self.deduplicated_items = len(deduplication_result.selected)
-        self.duplicate_items = len(deduplication_result.duplicates)
+        self.duplicate_items = deduplication_result.duplicate_count
         self.reduction = (self.duplicate_items / self.total_items) * 100
 
         # Map back to original strings
-        duplicates = deduplication_result.duplicates
-        for duplicate in duplicates:
-            original = duplicate.record
-            # Check if duplicates list is not empty before accessing
-            if (
-                duplicate.duplicates
-                and len(duplicate.duplicates) > 0
-                and len(duplicate.duplicates[0]) > 0
-            ):
-                duplicate_value = duplicate.duplicates[0][0]
-                self.items_map[original] = self.items_map[duplicate_value]
-                if not original in self.duplicates:
-                    self.duplicates[original] = duplicate_value
-
-        self.deduplicated = deduplication_result.selected
+        duplicate_pairs = deduplication_result.duplicate_pairs
+        for original, duplicate_value in duplicate_pairs:
+            self.items_map[original] = self.items_map[duplicate_value]
+        self._duplicate_pairs.append(duplicate_pairs)
+        self._duplicates = None
+
+        self.deduplicated = list(deduplication_result.selected)
+
+    def canonical_map(self) -> dict[str, str]:
+        """
+        Map each original item to its deduplicated representative.
+        """
+        items_map = self.items_map
+        # Representatives repeat across many relations, intern them so every
+        # reference shares one string object
+        return {
+            item: sys.intern(items_map[normalized])
+            for item, normalized in self.original_map.items()
+        }
 
     def stats(self) -> str:
         return f"Total items: {self.total_items}; Deduplicated items: {self.deduplicated_items}; Duplicate items: {self.duplicate_items}; Reduction: {self.reduction:.1f}"
@@ -100,70 +203,52 @@ def run_semhash_deduplication(
     """
     Deduplicate the graph.
     """
+    if not graph.entities and not graph.edges and not graph.relations:
+        return graph
+
     # Deduplicate each graph components
     entities_dedup = DeduplicateList(similarity_threshold)
     entities_dedup.deduplicate(graph.entities)
     edges_dedup = DeduplicateList(similarity_threshold)
     edges_dedup.deduplicate(graph.edges)
 
-    def _get_relation(relation: list[str]) -> list[str]:
-        """
-        Get the transformed relation.
-        """
-        # Handle case where entity might not be in original_map due to normalization
-        first_entity_original = relation[0]
-        if first_entity_original in entities_dedup.original_map:
-            first_entity = entities_dedup.items_map[
-                entities_dedup.original_map[first_entity_original]
-            ]
-        else:
-            # If not found, use the original entity (it might have been normalized differently)
-            first_entity = first_entity_original
-
-        second_entity_original = relation[2]
-        if second_entity_original in entities_dedup.original_map:
-            second_entity = entities_dedup.items_map[
-                entities_dedup.original_map[second_entity_original]
-            ]
-        else:
-            # If not found, use the original entity
-            second_entity = second_entity_original
-
-        edge_original = relation[1]
-        if edge_original in edges_dedup.original_map:
-            edge = edges_dedup.items_map[edges_dedup.original_map[edge_original]]
-        else:
-            # If not found, use the original edge
-            edge = edge_original
-
-        return [first_entity, edge, second_entity]
-
-    # Deduplicate the graph
-    new_entities = [
-        entities_dedup.items_map[item] for item in entities_dedup.deduplicated
-    ]
-    new_edges = [edges_dedup.items_map[item] for item in edges_dedup.deduplicated]
-    new_relations = [_get_relation(relation) for relation in graph.relations]
-
-    # Remove duplicate relations
-    new_relations = list(set(tuple(relation) for relation in new_relations))
+    # Nothing was merged, so the rewrite below would only copy the graph (the
+    # common case when deduplicating an already deduplicated graph). Graphs
+    # carrying fields the rewrite does not keep still go through it.
+    if (
+        entities_dedup.deduplicated_items == entities_dedup.total_items
+        and edges_dedup.deduplicated_items == edges_dedup.total_items
+        and graph.entity_clusters is None
+        and graph.edge_clusters is None
+        and graph.entity_metadata != {}
+    ):
+        return graph
+
+    # Resolve original -> representative once instead of going through
+    # original_map and items_map for every relation component
+    entity_map = entities_dedup.canonical_map()
+    edge_map = edges_dedup.canonical_map()
+
+    # Rewrite the graph in one pass over each component, collecting straight
+    # into sets so duplicate relations collapse as they are rewritten. Every
+    # item maps to a selected representative, so the map values are exactly
+    # the deduplicated entities and edges. Items missing from the maps (e.g.
+    # relation endpoints that are not in graph.entities) are kept as is.
+    new_entities = set(entity_map.values())
+    new_edges = set(edge_map.values())
+    new_relations = {
+        (entity_map.get(s, s), edge_map.get(p, p), entity_map.get(o, o))
+        for s, p, o in graph.relations
+    }
 
     # Update entity_metadata keys to match deduplicated entity names
     new_entity_metadata: dict[str, set[str]] | None = None
     if graph.entity_metadata:
         new_entity_metadata = {}
         for original_entity, metadata_set in graph.entity_metadata.items():
-            if original_entity in entities_dedup.original_map:
-                deduped_entity = entities_dedup.items_map[
-                    entities_dedup.original_map[original_entity]
-                ]
-            else:
-                deduped_entity = original_entity
+            deduped_entity = entity_map.get(original_entity, original_entity)
             # Merge metadata sets when entities are deduplicated together
-            if deduped_entity in new_entity_metadata:
-                new_entity_metadata[deduped_entity].update(metadata_set)
-            else:
-                new_entity_metadata[deduped_entity] = metadata_set.copy()
+            new_entity_metadata.setdefault(deduped_entity, set()).update(metadata_set)
 
     return Graph(
         entities=new_entities,
@@ -0,0 +1,86 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    LRU cache of text embeddings for one retrieval model, with an optional
+    time to live in seconds. Lets graphs that grow across calls (chunks,
+    aggregated graphs, repeated deduplication) only embed their new items.
+    """
+
+    def __init__(self, maxsize: int = 50_000, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[np.ndarray, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(text)
+            if entry is None:
+                return None
+            vector, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[text]
+                return None
+            self._entries.move_to_end(text)
+            return vector
+
+    def put(self, text: str, vector: np.ndarray) -> None:
+        with self._lock:
+            # Copied so a cached row does not keep its whole batch alive
+            self._entries[text] = (np.array(vector), time.monotonic())
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def encode(
+        self, model: Any, texts: list[str], show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """
+        Embeddings of texts as rows of an array, encoding only the distinct texts
+        that are not cached, in a single batch.
+        """
+        if not texts:
+            return model.encode(texts, show_progress_bar=show_progress_bar)
+
+        vectors = [self.get(text) for text in texts]
+        missing = list(
+            dict.fromkeys(
+                text for text, vector in zip(texts, vectors) if vector is None
+            )
+        )
+        if missing:
+            encoded = dict(
+                zip(missing, model.encode(missing, show_progress_bar=show_progress_bar))
+            )
+            for text, vector in encoded.items():
+                self.put(text, vector)
+            vectors = [
+                encoded[text] if vector is None else vector
+                for text, vector in zip(texts, vectors)
+            ]
+        return np.stack(vectors)
+
+
+# One cache per retrieval model, dropped together with the model
+_model_caches: "weakref.WeakKeyDictionary[Any, EmbeddingCache]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def embedding_cache(model: Any) -> EmbeddingCache:
+    """The shared embedding cache of a retrieval model."""
+    cache = _model_caches.get(model)
+    if cache is None:
+        cache = _model_caches.setdefault(model, EmbeddingCache())
+    return cache
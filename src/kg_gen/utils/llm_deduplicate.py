@@ -1,16 +1,115 @@
-from typing import List
+from functools import lru_cache
+from itertools import islice
+from typing import List, Optional
 from scipy.spatial.distance import cdist
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 import dspy
+import sys
+import threading
+import unicodedata
 from kg_gen.models import Graph
+from kg_gen.utils.embedding_cache import embedding_cache
 import logging
 from sklearn.metrics.pairwise import cosine_similarity
 from rank_bm25 import BM25Okapi
 from sentence_transformers import SentenceTransformer
 import numpy as np
+from pydantic import BaseModel, Field
 from sklearn.cluster import KMeans
 
 
+@lru_cache(maxsize=None)
+def _deduplicate_signature(type: str = "node") -> type[dspy.Signature]:
+    plural_type = "entities" if type == "node" else "edges"
+    singular_type = "entity" if type == "node" else "edge"
+
+    class Deduplicate(dspy.Signature):
+        __doc__ = f"""Find duplicate {plural_type} for the item and an alias that best represents the duplicates. Duplicates are those that are the same in meaning, such as with variation in tense, plural form, stem form, case, abbreviation, shorthand. Return an empty list if there are none. 
+        """
+        item: str = dspy.InputField()
+        set: list[str] = dspy.InputField()
+        duplicates: list[str] = dspy.OutputField(
+            description="Exact matches to items in {plural_type} set"
+        )
+        alias: str = dspy.OutputField(
+            description=f"Best {singular_type} name to represent the duplicates, ideally from the {plural_type} set"
+        )
+
+    return Deduplicate
+
+
+@lru_cache(maxsize=None)
+def _deduplicate_batch_signature(type: str = "node") -> type[dspy.Signature]:
+    plural_type = "entities" if type == "node" else "edges"
+    singular_type = "entity" if type == "node" else "edge"
+
+    class Duplicates(BaseModel):
+        duplicates: list[str] = Field(
+            description=f"Exact matches to items in the {plural_type} set"
+        )
+        alias: str = Field(
+            description=f"Best {singular_type} name to represent the duplicates, ideally from the {plural_type} set"
+        )
+
+    class DeduplicateBatch(dspy.Signature):
+        __doc__ = f"""For each item, find duplicate {plural_type} in the set at the same position and an alias that best represents the duplicates. Duplicates are those that are the same in meaning, such as with variation in tense, plural form, stem form, case, abbreviation, shorthand. Use an empty duplicates list if there are none. Return exactly one result per item, in order.
+        """
+        items: list[str] = dspy.InputField()
+        sets: list[list[str]] = dspy.InputField()
+        results: list[Duplicates] = dspy.OutputField()
+
+    return DeduplicateBatch
+
+
+def _pre_cluster_key(item: str) -> str:
+    """Case, whitespace and Unicode compatibility form insensitive key of an item."""
+    # Most items are already lowercase ASCII and can be used as is. Outside
+    # ASCII, NFKC folds compatibility variants ("ﬀ" and "ff", full-width
+    # letters) and casefold() covers the case mappings lower() misses.
+    if item.isascii():
+        key = item if item.islower() else item.lower()
+    else:
+        key = unicodedata.normalize("NFKC", item).casefold()
+    # Only split/join when there is whitespace to collapse, other whitespace
+    # than a single ASCII space is not printable
+    if not key.isprintable() or "  " in key or key[:1] == " " or key[-1:] == " ":
+        key = " ".join(key.split())
+    return key
+
+
+def _representative_order(item: str) -> tuple:
+    """
+    Sort key preferring the representative of a pre-cluster: already NFKC
+    normalized (so "Effort" is kept over the shorter ligature "eﬀort"), not
+    all caps (so "Person" and "in" are kept over "PERSON" and "IN"), then the
+    shortest.
+    """
+    compatibility_form = (
+        not item.isascii() and unicodedata.normalize("NFKC", item) != item
+    )
+    return (compatibility_form, item.isupper(), len(item), item)
+
+
+def _pre_cluster(items: list[str]) -> tuple[list[str], dict[str, set[str]]]:
+    """
+    Group items that only differ in case and whitespace, which need no LM call.
+    Returns the preferred item of each group as its representative, with the
+    groups of more than one item keyed by representative.
+    """
+    groups: dict[str, list[str]] = {}
+    for item in items:
+        groups.setdefault(_pre_cluster_key(item), []).append(item)
+
+    representatives = []
+    pre_clusters = {}
+    for group in groups.values():
+        representative = min(group, key=_representative_order)
+        representatives.append(representative)
+        if len(group) > 1:
+            pre_clusters[representative] = set(group)
+    return representatives, pre_clusters
+
+
 class LLMDeduplicate:
     graph: Graph
     nodes: list[str]
@@ -22,31 +121,55 @@ class LLMDeduplicate:
 
     logger: logging.Logger = logging.getLogger(__name__)
 
-    def __init__(self, retrieval_model: SentenceTransformer, lm: dspy.LM, graph: Graph):
+    def __init__(
+        self,
+        retrieval_model: SentenceTransformer,
+        lm: dspy.LM,
+        graph: Graph,
+        item_concurrency: int = 4,
+        batch_items: bool = False,
+        max_concurrent_calls: int = 16,
+    ):
         """
         Initialize KG-assisted RAG with cached embeddings, BM25 tokens, and text chunk store.
+        item_concurrency is the number of items per cluster whose LLM calls run ahead concurrently.
+        With batch_items, those items are sent together in a single LLM call instead.
+        max_concurrent_calls bounds the LLM calls in flight across all clusters.
         """
         self.graph = graph
-        self.nodes = list(graph.entities)
-        self.edges = list(graph.edges)
+        self.item_concurrency = max(1, item_concurrency)
+        self.batch_items = batch_items
+        # Clusters and their items run concurrently, without a shared bound that
+        # would be up to 64 * item_concurrency calls against the provider at once
+        self._call_slots = threading.BoundedSemaphore(max(1, max_concurrent_calls))
+        # Exact variants are folded into one item before clustering and LLM
+        # deduplication, and expanded again when the clusters are merged
+        self.nodes, self.node_pre_clusters = _pre_cluster(list(graph.entities))
+        self.edges, self.edge_pre_clusters = _pre_cluster(list(graph.edges))
         self.node_clusters = graph.entity_clusters or []
         self.edge_clusters = graph.edge_clusters or []
         self.retrieval_model = retrieval_model
         self.lm = lm
 
-        # Embeddings and BM25 tokens for nodes
-        self.node_embeddings = retrieval_model.encode(
-            self.nodes, show_progress_bar=True
+        # Embeddings for nodes and edges, encoded in one pass and split. Items
+        # embedded by earlier runs with the same model come from the cache.
+        embeddings = embedding_cache(retrieval_model).encode(
+            retrieval_model, self.nodes + self.edges, show_progress_bar=True
         )
+        self.node_embeddings = embeddings[: len(self.nodes)]
+        self.edge_embeddings = embeddings[len(self.nodes) :]
+        # Queries are the items themselves, look up their embeddings and tokens
+        # instead of encoding them again
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.edge_index = {edge: i for i, edge in enumerate(self.edges)}
+
+        # BM25 tokens for nodes
         self.node_bm25_tokenized = [text.lower().split() for text in self.nodes]
 
         # Always rebuild BM25 from tokens (it's fast and simpler than serializing the object)
         self.node_bm25 = BM25Okapi(self.node_bm25_tokenized)
 
-        # Embeddings and BM25 tokens for edges
-        self.edge_embeddings = retrieval_model.encode(
-            self.edges, show_progress_bar=True
-        )
+        # BM25 tokens for edges
         self.edge_bm25_tokenized = [text.lower().split() for text in self.edges]
 
         # Always rebuild BM25 from tokens
@@ -55,29 +178,70 @@ class LLMDeduplicate:
         dspy.configure(lm=lm)
 
     def get_relevant_items(
-        self, query: str, top_k: int = 50, type: str = "node"
+        self,
+        query: str,
+        top_k: int = 50,
+        type: str = "node",
+        candidates: Optional[list[str]] = None,
     ) -> list[str]:
         """
         Use rank fusion of BM25 + embedding to retrieve top-k nodes.
+        If candidates is given, only those items (other than the query) are ranked.
         """
-        query_tokens = query.lower().split()
+        if type == "node":
+            items, item_index = self.nodes, self.node_index
+            bm25, tokenized = self.node_bm25, self.node_bm25_tokenized
+            embeddings = self.node_embeddings
+        else:
+            items, item_index = self.edges, self.edge_index
+            bm25, tokenized = self.edge_bm25, self.edge_bm25_tokenized
+            embeddings = self.edge_embeddings
+        index = item_index.get(query)
+        query_embeddings = embeddings
+
+        candidate_ids = None
+        if candidates is not None:
+            candidate_ids = [
+                item_index[candidate]
+                for candidate in candidates
+                if candidate != query and candidate in item_index
+            ]
+            if not candidate_ids:
+                return []
+            embeddings = embeddings[candidate_ids]
 
         # BM25
-        bm25_scores = (
-            self.node_bm25.get_scores(query_tokens)
-            if type == "node"
-            else self.edge_bm25.get_scores(query_tokens)
-        )
+        query_tokens = query.lower().split() if index is None else tokenized[index]
+        if candidate_ids is None:
+            bm25_scores = bm25.get_scores(query_tokens)
+        else:
+            bm25_scores = np.asarray(bm25.get_batch_scores(query_tokens, candidate_ids))
 
         # Embedding
-        query_embedding = self.retrieval_model.encode([query], show_progress_bar=False)
-        embeddings = self.node_embeddings if type == "node" else self.edge_embeddings
+        if index is None:
+            query_embedding = self.retrieval_model.encode(
+                [query], show_progress_bar=False
+            )
+        else:
+            query_embedding = query_embeddings[index : index + 1]
         embedding_scores = cosine_similarity(query_embedding, embeddings).flatten()
 
         # Rank fusion (equal weighting)
         combined_scores = 0.5 * bm25_scores + 0.5 * embedding_scores
-        top_indices = np.argsort(combined_scores)[::-1][:top_k]
-        items = self.nodes if type == "node" else self.edges
+        n_scores = len(combined_scores)
+        if 0 < top_k < n_scores:
+            # Partition out the top k before sorting instead of sorting every
+            # score, keeping any ties with the k-th so the stable sort below
+            # picks the same items as sorting everything
+            kth = np.partition(combined_scores, n_scores - top_k)[n_scores - top_k]
+            top_indices = np.flatnonzero(combined_scores >= kth)
+        else:
+            top_indices = np.arange(n_scores)
+        top_indices = top_indices[
+            np.argsort(-combined_scores[top_indices], kind="stable")
+        ][:top_k]
+        if candidate_ids is not None:
+            top_indices = [candidate_ids[i] for i in top_indices]
         top_items = [items[i] for i in top_indices]
 
         return top_items
@@ -167,10 +331,63 @@ class LLMDeduplicate:
                 # Add edge clusters to self
                 self.edge_clusters = clusters_data
 
+    def _find_duplicates(
+        self, item: str, type: str = "node", candidates: Optional[list[str]] = None
+    ) -> tuple[list[str], dspy.Prediction]:
+        """
+        Retrieve the items relevant to item and ask the LM which are duplicates.
+        """
+        relevant_items = self.get_relevant_items(item, 16, type, candidates)
+        if not relevant_items:
+            return relevant_items, dspy.Prediction(duplicates=[], alias=item)
+
+        # with dspy.context(lm=self.lm):
+        deduplicate = dspy.Predict(_deduplicate_signature(type))
+        with self._call_slots:
+            result = deduplicate(item=item, set=relevant_items)
+        return relevant_items, result
+
+    def _find_duplicates_batch(
+        self,
+        batch: list[str],
+        type: str = "node",
+        candidates: Optional[list[str]] = None,
+    ) -> list[tuple[list[str], BaseModel]]:
+        """
+        Batched _find_duplicates, one LM call for all items of the batch.
+        Falls back to one call per item if the LM does not return one result per item.
+        """
+        relevant_sets = [
+            self.get_relevant_items(item, 16, type, candidates) for item in batch
+        ]
+        if not any(relevant_sets):
+            return [
+                (relevant_items, dspy.Prediction(duplicates=[], alias=item))
+                for item, relevant_items in zip(batch, relevant_sets)
+            ]
+
+        deduplicate = dspy.Predict(_deduplicate_batch_signature(type))
+        with self._call_slots:
+            results = deduplicate(items=batch, sets=relevant_sets).results
+        if len(results) != len(batch):
+            self.logger.debug(
+                "Batched deduplication returned %s results for %s items, retrying per item",
+                len(results),
+                len(batch),
+            )
+            return [self._find_duplicates(item, type, candidates) for item in batch]
+        return list(zip(relevant_sets, results))
+
     def deduplicate_cluster(
         self, cluster: list[str], type: str = "node"
     ) -> tuple[set, dict[str, list[str]]]:
-        cluster = cluster.copy()
+        # Insertion ordered dict as an ordered set of the pending items: O(1)
+        # membership and removal of duplicates, popitem() takes the last item
+        # like list.pop() did
+        cluster = dict.fromkeys(cluster)
+        # Only items of this cluster can be accepted as duplicates, so they are
+        # the only ones worth sending to the LM
+        members = list(cluster)
 
         items = set()
         item_clusters = {}
@@ -181,73 +398,130 @@ class LLMDeduplicate:
             "Starting deduplication of %s %s in cluster", len(cluster), plural_type
         )
 
-        processed_count = 0
-        while len(cluster) > 0:
-            processed_count += 1
-            item = cluster.pop()
+        # Checked once, the per-item debug logs below would otherwise build their
+        # arguments for every item even with debug logging disabled
+        debug = self.logger.isEnabledFor(logging.DEBUG)
 
-            self.logger.debug(
-                "[%s/%s] Processing %s: '%s'",
-                processed_count,
-                len(cluster),
-                singular_type,
-                item,
-            )
-
-            relevant_items = self.get_relevant_items(item, 16, type)
-
-            self.logger.debug(
-                "  Found %s relevant %s for '%s'",
-                len(relevant_items),
-                plural_type,
-                item,
-            )
-            if len(relevant_items) > 0:
-                self.logger.debug(
-                    "  Sample relevant items: %s%s",
-                    relevant_items[:3],
-                    ("..." if len(relevant_items) > 3 else ""),
-                )
-
-            class Deduplicate(dspy.Signature):
-                __doc__ = f"""Find duplicate {plural_type} for the item and an alias that best represents the duplicates. Duplicates are those that are the same in meaning, such as with variation in tense, plural form, stem form, case, abbreviation, shorthand. Return an empty list if there are none. 
-                """
-                item: str = dspy.InputField()
-                set: list[str] = dspy.InputField()
-                duplicates: list[str] = dspy.OutputField(
-                    description="Exact matches to items in {plural_type} set"
-                )
-                alias: str = dspy.OutputField(
-                    description=f"Best {singular_type} name to represent the duplicates, ideally from the {plural_type} set"
-                )
-
-            # with dspy.context(lm=self.lm):
-            deduplicate = dspy.Predict(Deduplicate)
-            result = deduplicate(item=item, set=relevant_items)
-            items.add(result.alias)
-
-            # Filter duplicates to only include those that exist in the cluster
-            duplicates = [dup for dup in result.duplicates if dup in cluster]
+        processed_count = 0
+        # item -> (future, index in the batch result or None for a single item call)
+        in_flight: dict[str, tuple[Future, int | None]] = {}
+        # Batches are double buffered
+        look_ahead = self.item_concurrency * (2 if self.batch_items else 1)
+        with ThreadPoolExecutor(max_workers=self.item_concurrency) as executor:
+            while len(cluster) > 0:
+                # An item's LLM call only depends on the item itself, so keep the
+                # calls for the next items on the stack in flight as a sliding
+                # window, topped up after every item. Results are still applied
+                # one item at a time and in the same order as before. The bottom
+                # item is processed last, when nothing is left that it could be a
+                # duplicate of, so it never needs a call.
+                last = next(iter(cluster))
+                pending = [
+                    candidate
+                    for candidate in islice(reversed(cluster), look_ahead)
+                    if candidate not in in_flight and candidate != last
+                ]
+                if self.batch_items:
+                    # Send a batch when the top item needs it or a full batch is
+                    # ready, so the next batch runs while this one is applied
+                    top_waiting = next(reversed(cluster)) not in in_flight
+                    if pending and (
+                        top_waiting or len(pending) >= self.item_concurrency
+                    ):
+                        window = pending[: self.item_concurrency][::-1]
+                        future = executor.submit(
+                            self._find_duplicates_batch, window, type, members
+                        )
+                        for index, candidate in enumerate(window):
+                            in_flight[candidate] = (future, index)
+                else:
+                    for candidate in pending:
+                        in_flight[candidate] = (
+                            executor.submit(
+                                self._find_duplicates, candidate, type, members
+                            ),
+                            None,
+                        )
+
+                processed_count += 1
+                item, _ = cluster.popitem()
+
+                if debug:
+                    self.logger.debug(
+                        "[%s/%s] Processing %s: '%s'",
+                        processed_count,
+                        len(cluster),
+                        singular_type,
+                        item,
+                    )
+
+                if not cluster:
+                    # The remaining item was submitted before it became the last one
+                    pending_call = in_flight.pop(item, None)
+                    if pending_call is not None and pending_call[1] is None:
+                        pending_call[0].cancel()
+                    if debug:
+                        self.logger.debug(
+                            "  ✗ No %s left to compare '%s' with, keeping as is",
+                            plural_type,
+                            item,
+                        )
+                    items.add(item)
+                    item_clusters[item] = {item}
+                    break
+
+                future, index = in_flight.pop(item)
+                if index is None:
+                    relevant_items, result = future.result()
+                else:
+                    relevant_items, result = future.result()[index]
+
+                if debug:
+                    self.logger.debug(
+                        "  Found %s relevant %s for '%s'",
+                        len(relevant_items),
+                        plural_type,
+                        item,
+                    )
+                    if len(relevant_items) > 0:
+                        self.logger.debug(
+                            "  Sample relevant items: %s%s",
+                            relevant_items[:3],
+                            ("..." if len(relevant_items) > 3 else ""),
+                        )
+
+                items.add(result.alias)
+
+                # Filter duplicates to only include those that exist in the cluster
+                duplicates = [
+                    dup for dup in dict.fromkeys(result.duplicates) if dup in cluster
+                ]
 
-            if len(duplicates) > 0:
-                self.logger.debug(
-                    "  ✓ Found %s duplicates for '%s'", len(duplicates), item
-                )
-                self.logger.info(
-                    "  → Using alias '%s' to represent: '%s' and %s",
-                    result.alias,
-                    item,
-                    duplicates,
-                )
-                item_clusters[result.alias] = {item}
-                for duplicate in duplicates:
-                    cluster.remove(duplicate)
-                    item_clusters[result.alias].add(duplicate)
-            else:
-                self.logger.debug(
-                    "  ✗ No duplicates found for '%s', keeping as is", item
-                )
-                item_clusters[item] = {item}
+                if len(duplicates) > 0:
+                    if debug:
+                        self.logger.debug(
+                            "  ✓ Found %s duplicates for '%s'", len(duplicates), item
+                        )
+                    self.logger.info(
+                        "  → Using alias '%s' to represent: '%s' and %s",
+                        result.alias,
+                        item,
+                        duplicates,
+                    )
+                    item_clusters[result.alias] = {item}
+                    for duplicate in duplicates:
+                        del cluster[duplicate]
+                        item_clusters[result.alias].add(duplicate)
+                        # Its own call is no longer needed
+                        pending_call = in_flight.pop(duplicate, None)
+                        if pending_call is not None and pending_call[1] is None:
+                            pending_call[0].cancel()
+                else:
+                    if debug:
+                        self.logger.debug(
+                            "  ✗ No duplicates found for '%s', keeping as is", item
+                        )
+                    item_clusters[item] = {item}
 
         self.logger.debug(
             "Deduplication complete: %s unique %s from original %s",
@@ -267,19 +541,20 @@ class LLMDeduplicate:
 
         pool = ThreadPoolExecutor(max_workers=64)
 
-        # Process node clusters in parallel
-        node_futures = []
-        cnt_nodes = 0
-        for i, cluster in enumerate(self.node_clusters):
-            cnt_nodes += len(cluster)
-            node_futures.append(pool.submit(self.deduplicate_cluster, cluster, "node"))
-
-        # Process edge clusters in parallel
-        edge_futures = []
-        cnt_edges = 0
-        for i, cluster in enumerate(self.edge_clusters):
-            cnt_edges += len(cluster)
-            edge_futures.append(pool.submit(self.deduplicate_cluster, cluster, "edge"))
+        # Process node and edge clusters in parallel. The longest clusters are
+        # submitted first so that a large cluster picked up last doesn't leave
+        # the rest of the pool idle, results are still merged in cluster order.
+        cnt_nodes = sum(len(cluster) for cluster in self.node_clusters)
+        cnt_edges = sum(len(cluster) for cluster in self.edge_clusters)
+        jobs = [(cluster, "node", i) for i, cluster in enumerate(self.node_clusters)]
+        jobs += [(cluster, "edge", i) for i, cluster in enumerate(self.edge_clusters)]
+        jobs.sort(key=lambda job: len(job[0]), reverse=True)
+
+        submitted = {}
+        for cluster, type, i in jobs:
+            submitted[type, i] = pool.submit(self.deduplicate_cluster, cluster, type)
+        node_futures = [submitted["node", i] for i in range(len(self.node_clusters))]
+        edge_futures = [submitted["edge", i] for i in range(len(self.edge_clusters))]
 
         # Collect results from node futures
         for i, future in enumerate(node_futures):
@@ -305,31 +580,44 @@ class LLMDeduplicate:
             cnt_edges,
         )
 
-        # Update relations based on clusters
+        # Add back the variants folded into each member before deduplication
+        for clusters, pre_clusters in (
+            (entity_clusters, self.node_pre_clusters),
+            (edge_clusters, self.edge_pre_clusters),
+        ):
+            if pre_clusters:
+                for rep, cluster in clusters.items():
+                    clusters[rep] = cluster.union(
+                        *(pre_clusters.get(member, ()) for member in cluster)
+                    )
+
+        # Flatten the clusters into member -> representative lookups once. The
+        # first cluster containing a member wins, as with a scan in cluster order.
+        # The kept entities, edges and representatives are interned so the
+        # relation rewrite below can swap each equal component (often its own
+        # copy, e.g. in aggregated or loaded graphs) for that one shared object.
+        intern = sys.intern
+        entities = set(map(intern, entities))
+        edges = set(map(intern, edges))
+        entity_lookup: dict[str, str] = {}
+        for rep, cluster in entity_clusters.items():
+            rep = intern(rep)
+            for member in cluster:
+                entity_lookup.setdefault(member, rep)
+        edge_lookup: dict[str, str] = {}
+        for rep, cluster in edge_clusters.items():
+            rep = intern(rep)
+            for member in cluster:
+                edge_lookup.setdefault(member, rep)
+
+        # Update relations based on clusters, items that are already kept
+        # entities or edges are replaced by their interned object
         relations: set[tuple[str, str, str]] = set()
 
         for s, p, o in self.graph.relations:
-            # Look up subject in entity clusters
-            if s not in entities:
-                for rep, cluster in entity_clusters.items():
-                    if s in cluster:
-                        s = rep
-                        break
-
-            # Look up predicate in edge clusters
-            if p not in edges:
-                for rep, cluster in edge_clusters.items():
-                    if p in cluster:
-                        p = rep
-                        break
-
-            # Look up object in entity clusters
-            if o not in entities:
-                for rep, cluster in entity_clusters.items():
-                    if o in cluster:
-                        o = rep
-                        break
-
+            s = intern(s) if s in entities else entity_lookup.get(s, s)
+            p = intern(p) if p in edges else edge_lookup.get(p, p)
+            o = intern(o) if o in entities else entity_lookup.get(o, o)
             relations.add((s, p, o))
 
         # Update entity_metadata keys to match deduplicated entity names
@@ -338,16 +626,11 @@ class LLMDeduplicate:
             new_entity_metadata = {}
             for original_entity, metadata_set in self.graph.entity_metadata.items():
                 # Find the deduplicated representative for this entity
-                deduped_entity = original_entity
-                for rep, cluster in entity_clusters.items():
-                    if original_entity in cluster:
-                        deduped_entity = rep
-                        break
+                deduped_entity = entity_lookup.get(original_entity, original_entity)
                 # Merge metadata sets when entities are deduplicated together
-                if deduped_entity in new_entity_metadata:
-                    new_entity_metadata[deduped_entity].update(metadata_set)
-                else:
-                    new_entity_metadata[deduped_entity] = metadata_set.copy()
+                new_entity_metadata.setdefault(deduped_entity, set()).update(
+                    metadata_set
+                )
 
         # Create new Graph instance with deduplicated data
         deduped_graph = Graph(
@@ -6,12 +6,29 @@ to Neo4j databases, both local and cloud instances (Neo4j AuraDB).
 """
 
 from typing import Optional, Dict, Any, List
+from functools import lru_cache
 import logging
+import re
 from neo4j import GraphDatabase, Driver
 from ..models import Graph
 
 logger = logging.getLogger(__name__)
 
+# Separators that become underscores in relationship types, anything else that
+# is not a word character is dropped and runs of underscores are collapsed
+_REL_TYPE_SEPARATORS = str.maketrans({" ": "_", "-": "_", ".": "_", "/": "_"})
+_REL_TYPE_INVALID = re.compile(r"\W+")
+_REL_TYPE_UNDERSCORES = re.compile(r"__+")
+
+
+# Predicates repeat across relations, each distinct one is only sanitized once
+@lru_cache(maxsize=None)
+def _sanitize_rel_type(predicate: str) -> str:
+    """Turn a predicate into a Neo4j relationship type, e.g. 'is part-of' -> 'IS_PART_OF'."""
+    rel_type = _REL_TYPE_INVALID.sub("", predicate.translate(_REL_TYPE_SEPARATORS))
+    rel_type = _REL_TYPE_UNDERSCORES.sub("_", rel_type).strip("_").upper()
+    return rel_type or "RELATED_TO"
+
 
 class Neo4jUploader:
     """Handles uploading knowledge graphs to Neo4j databases."""
@@ -132,40 +149,40 @@ class Neo4jUploader:
         SET n += $properties
         """
 
-        result = session.run(
-            query, entities=list(graph.entities), properties=properties
-        )
-        return len(list(result))
+        # The query returns no rows, consume the result instead of materializing
+        # it and count the entities that were sent
+        entities = list(graph.entities)
+        session.run(query, entities=entities, properties=properties).consume()
+        return len(entities)
 
     def _create_relationships(
         self, session, graph: Graph, graph_name: Optional[str] = None
     ) -> int:
         """Create relationships in Neo4j from graph relations."""
-        rel_count = 0
-
+        # The relationship type can't be a query parameter, so send one UNWIND
+        # batch per type instead of one round trip per relation
+        rows_by_type: Dict[str, List[Dict[str, str]]] = {}
         for subject, predicate, obj in graph.relations:
-            # Create relationship with predicate as relationship type
-            # Clean predicate name for Neo4j (replace spaces with underscores)
-            rel_type = predicate.replace(" ", "_").replace("-", "_").upper()
+            rows_by_type.setdefault(_sanitize_rel_type(predicate), []).append(
+                {"subject": subject, "object": obj, "predicate": predicate}
+            )
 
+        rel_count = 0
+        for rel_type, rows in rows_by_type.items():
+            # Quoted since the type may still start with a digit
             query = f"""
-            MATCH (s:Entity {{name: $subject}})
-            MATCH (o:Entity {{name: $object}})
-            MERGE (s)-[r:{rel_type}]->(o)
-            SET r.predicate = $predicate
+            UNWIND $rows AS row
+            MATCH (s:Entity {{name: row.subject}})
+            MATCH (o:Entity {{name: row.object}})
+            MERGE (s)-[r:`{rel_type}`]->(o)
+            SET r.predicate = row.predicate
             """
 
             if graph_name:
                 query += "SET r.graph_name = $graph_name"
 
-            session.run(
-                query,
-                subject=subject,
-                object=obj,
-                predicate=predicate,
-                graph_name=graph_name,
-            )
-            rel_count += 1
+            session.run(query, rows=rows, graph_name=graph_name)
+            rel_count += len(rows)
 
         return rel_count
 
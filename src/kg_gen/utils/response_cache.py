@@ -0,0 +1,149 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+import litellm
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# The direct litellm.responses calls in the extraction steps bypass the dspy.LM
+# cache, so identical requests (e.g. repeated texts) are memoized here instead,
+# in memory and in a persistent cache directory shared across runs
+_MAX_ENTRIES = 4096
+_responses: dict[str, str] = {}
+# Chunks are extracted from many threads at once
+_responses_lock = threading.Lock()
+
+# Bump to invalidate the persistent entries written by earlier versions
+_CACHE_VERSION = 1
+
+# Persistent entries expire after a month, and the oldest ones beyond the
+# entry limit are removed, checked every _PRUNE_EVERY writes of a process
+_PERSISTENT_TTL = 30 * 24 * 60 * 60
+_MAX_PERSISTENT_ENTRIES = 20_000
+_PRUNE_EVERY = 256
+_writes = itertools.count()
+
+
+def _cache_dir() -> Path:
+    return Path(
+        os.environ.get("KG_GEN_CACHE_DIR", Path.home() / ".kg_gen_cache")
+    ).expanduser()
+
+
+def _request_key(kwargs: dict) -> str:
+    # The api key does not change the response, keep it out of the key
+    request = {k: v for k, v in kwargs.items() if k != "api_key"}
+    request["_cache_version"] = _CACHE_VERSION
+    return hashlib.blake2b(
+        json.dumps(request, sort_keys=True, default=str).encode(), digest_size=16
+    ).hexdigest()
+
+
+def _read_persistent(key: str) -> Optional[str]:
+    try:
+        with open(_cache_dir() / f"{key}.json", encoding="utf-8") as f:
+            if time.time() - os.fstat(f.fileno()).st_mtime > _PERSISTENT_TTL:
+                return None
+            return json.load(f)["text"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _prune_persistent(cache_dir: Path) -> None:
+    """Remove expired entries, then the oldest ones beyond the entry limit."""
+    try:
+        entries = []
+        for path in cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        expired_before = time.time() - _PERSISTENT_TTL
+        for i, (mtime, path) in enumerate(entries):
+            if i >= _MAX_PERSISTENT_ENTRIES or mtime < expired_before:
+                path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Could not prune response cache %s: %s", cache_dir, e)
+
+
+def _write_persistent(key: str, text: str) -> None:
+    cache_dir = _cache_dir()
+    path = cache_dir / f"{key}.json"
+    # Write to a temporary file first so concurrent readers never see a partial entry
+    tmp_path = cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"text": text}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write response cache entry %s: %s", path, e)
+        return
+    if next(_writes) % _PRUNE_EVERY == 0:
+        _prune_persistent(cache_dir)
+
+
+def _request_text(kwargs: dict) -> str:
+    return litellm.responses(**kwargs).output[-1].content[0].text
+
+
+def parsed_response(kwargs: dict, parse: Callable[[str], T], cache: bool = True) -> T:
+    """
+    Return parse() of the output text of litellm.responses(**kwargs), served
+    from an in-memory and persistent cache keyed by the request content when
+    cache is True. Setting the KG_GEN_NOCACHE environment variable bypasses both.
+
+    Only responses parse() accepts are cached. A ValueError from parse() (e.g.
+    a pydantic ValidationError on a truncated or refused response) is raised
+    without caching, and a cached entry it rejects is requested again.
+    """
+    if not cache or os.environ.get("KG_GEN_NOCACHE"):
+        return parse(_request_text(kwargs))
+
+    key = _request_key(kwargs)
+    with _responses_lock:
+        text = _responses.get(key)
+    if text is not None:
+        return parse(text)
+
+    text = _read_persistent(key)
+    if text is not None:
+        try:
+            result = parse(text)
+        except ValueError:
+            text = None
+    if text is None:
+        text = _request_text(kwargs)
+        result = parse(text)
+        _write_persistent(key, text)
+
+    with _responses_lock:
+        if key not in _responses and len(_responses) >= _MAX_ENTRIES:
+            # Evict the oldest entry, dicts keep insertion order
+            del _responses[next(iter(_responses))]
+        _responses[key] = text
+    return result
+
+
+def response_text(kwargs: dict, cache: bool = True) -> str:
+    """
+    Return the output text of litellm.responses(**kwargs), cached as in
+    parsed_response. Every response is accepted.
+    """
+    return parsed_response(kwargs, str, cache=cache)
+
+
+def clear_response_cache() -> None:
+    """Clear the in-memory cache, the persistent entries are kept."""
+    with _responses_lock:
+        _responses.clear()
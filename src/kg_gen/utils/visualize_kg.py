@@ -5,6 +5,7 @@ from __future__ import annotations
 import hashlib
 import json
 from collections import Counter, defaultdict, deque
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 import colorsys
@@ -13,12 +14,14 @@ import webbrowser
 from kg_gen.models import Graph
 
 
+# Labels repeat across visualizations of the same (or a growing) graph
+@lru_cache(maxsize=65536)
 def _string_to_color(label: str) -> str:
     """Generate a deterministic pastel-like color for a given label."""
-    digest = hashlib.sha1(label.encode("utf-8")).hexdigest()
-    hue = int(digest[:2], 16) / 255.0
-    saturation = 0.55 + (int(digest[2:4], 16) / 255.0) * 0.3
-    lightness = 0.45 + (int(digest[4:6], 16) / 255.0) * 0.25
+    digest = hashlib.sha1(label.encode("utf-8")).digest()
+    hue = digest[0] / 255.0
+    saturation = 0.55 + (digest[1] / 255.0) * 0.3
+    lightness = 0.45 + (digest[2] / 255.0) * 0.25
     r, g, b = colorsys.hls_to_rgb(hue, lightness, saturation)
     return f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}"
 
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import src.kg_gen.utils.deduplicate as deduplicate
+from src.kg_gen.utils.deduplicate import DeduplicateList, clear_deduplication_cache
+
+
+class _FakeSemHash:
+    """Marks "X car" as a duplicate of "X auto", counting the embedded record sets."""
+
+    built = []
+
+    def __init__(self, records):
+        self.records = records
+
+    @classmethod
+    def from_records(cls, records):
+        cls.built.append(records)
+        return cls(records)
+
+    def self_deduplicate(self, threshold):
+        duplicates = [
+            SimpleNamespace(
+                record=record, duplicates=[(record.replace("car", "auto"), 0.99)]
+            )
+            for record in self.records
+            if record.endswith("car") and record.replace("car", "auto") in self.records
+        ]
+        duplicate_records = {duplicate.record for duplicate in duplicates}
+        return SimpleNamespace(
+            selected=[r for r in self.records if r not in duplicate_records],
+            duplicates=duplicates,
+            # Stands in for the embeddings SemHash results keep alive
+            embeddings=object(),
+        )
+
+
+def test_self_deduplication_is_cached_and_clearable(monkeypatch):
+    monkeypatch.setattr(deduplicate, "SemHash", _FakeSemHash)
+    monkeypatch.setattr(_FakeSemHash, "built", [])
+    clear_deduplication_cache()
+    items = ["red car", "red auto", "tree"]
+
+    first = DeduplicateList()
+    first.deduplicate(items)
+    second = DeduplicateList()
+    second.deduplicate(items)
+
+    assert len(_FakeSemHash.built) == 1
+    assert second.deduplicated == ["red auto", "tree"]
+    assert second.duplicates == {"red car": "red auto"}
+    assert second.canonical_map()["red car"] == "red auto"
+    assert second.duplicate_items == 1
+    # Only plain strings are cached, not the SemHash result
+    cached = deduplicate._self_deduplicate(("red auto", "red car", "tree"), 0.95)
+    assert len(_FakeSemHash.built) == 1
+    assert not hasattr(cached, "embeddings")
+
+    clear_deduplication_cache()
+    DeduplicateList().deduplicate(items)
+    assert len(_FakeSemHash.built) == 2
@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.kg_gen.kg_gen import KGGen
+from src.kg_gen.models import Graph
+from src.kg_gen.utils.embedding_cache import EmbeddingCache
+from src.kg_gen.utils.llm_deduplicate import LLMDeduplicate
+
+
+class _CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.encoded.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts])
+
+
+def test_encode_only_embeds_misses():
+    model = _CountingModel()
+    cache = EmbeddingCache()
+
+    first = cache.encode(model, ["a", "bb", "a"])
+    second = cache.encode(model, ["bb", "ccc"])
+
+    assert model.encoded == [["a", "bb"], ["ccc"]]
+    assert first.tolist() == [[1, 1], [2, 1], [1, 1]]
+    assert second.tolist() == [[2, 1], [3, 1]]
+
+
+def test_lru_eviction_and_ttl():
+    cache = EmbeddingCache(maxsize=2)
+    cache.put("a", np.zeros(2))
+    cache.put("b", np.zeros(2))
+    cache.get("a")
+    cache.put("c", np.zeros(2))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+
+    expired = EmbeddingCache(ttl=0)
+    expired.put("a", np.zeros(2))
+    assert expired.get("a") is None
+
+
+def _graph():
+    return Graph(
+        entities={"Harry", "Ginny"},
+        edges={"married"},
+        relations={("Harry", "married", "Ginny")},
+    )
+
+
+def test_generate_embeddings_uses_cache():
+    model = _CountingModel()
+    kg = KGGen()
+
+    graph = KGGen.to_nx(_graph())
+
+    node_embeddings, relation_embeddings = kg.generate_embeddings(graph, model)
+    kg.generate_embeddings(graph, model)
+
+    assert node_embeddings == {"Harry": [5, 1], "Ginny": [5, 1]}
+    assert relation_embeddings == {"married": [7, 1]}
+    assert len(model.encoded) == 1
+    assert sorted(model.encoded[0]) == ["Ginny", "Harry", "married"]
+
+
+def test_llm_deduplicate_uses_cache():
+    model = _CountingModel()
+
+    LLMDeduplicate(model, None, _graph())
+    deduplicate = LLMDeduplicate(model, None, _graph())
+
+    assert len(model.encoded) == 1
+    assert deduplicate.node_embeddings.tolist() == [[5, 1], [5, 1]]
+    assert deduplicate.edge_embeddings.tolist() == [[7, 1]]
@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.kg_gen.models import Graph
+
+
+def test_to_id_arrays():
+    graph = Graph(
+        entities={"Harry", "Ginny", "Albus"},
+        edges={"married", "father of"},
+        relations={("Harry", "married", "Ginny"), ("Harry", "father of", "Albus")},
+    )
+
+    entities, edges, relations = graph.to_id_arrays()
+
+    assert entities == ["Albus", "Ginny", "Harry"]
+    assert edges == ["father of", "married"]
+    assert relations.dtype == np.int32
+    assert relations.tolist() == [[2, 0, 0], [2, 1, 1]]
+
+
+def test_to_id_arrays_missing_endpoints_and_empty():
+    graph = Graph(
+        entities={"Harry"}, edges=set(), relations={("Harry", "knows", "Ron")}
+    )
+    entities, edges, relations = graph.to_id_arrays()
+    assert entities == ["Harry", "Ron"]
+    assert edges == ["knows"]
+    assert relations.tolist() == [[0, 0, 1]]
+
+    _, _, relations = Graph(entities=set(), edges=set(), relations=set()).to_id_arrays()
+    assert relations.shape == (0, 3)
+
+
+def test_from_file_shares_strings_and_fixes_missing(tmp_path):
+    path = tmp_path / "graph.json"
+    # Longer than the 64 characters pydantic-core already reuses when parsing
+    long_name = "Harry Potter, the boy who lived, son of James and Lily Potter of Godric's Hollow"
+    long_predicate = (
+        "was married in a small ceremony at the Burrow, the Weasley family home, to"
+    )
+    Graph(
+        entities={long_name},
+        edges={long_predicate},
+        relations={(long_name, long_predicate, "Ginny")},
+    ).to_file(str(path))
+
+    graph = Graph.from_file(str(path))
+
+    assert graph.entities == {long_name, "Ginny"}
+    assert graph.edges == {long_predicate}
+    ((subject, predicate, _),) = graph.relations
+    assert any(subject is entity for entity in graph.entities)
+    assert any(predicate is edge for edge in graph.edges)
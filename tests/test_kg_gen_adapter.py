@@ -0,0 +1,42 @@
+import dspy
+
+import src.kg_gen.kg_gen as kg_gen_module
+from src.kg_gen.kg_gen import KGGen
+
+
+def _record_adapter(monkeypatch):
+    adapters = []
+
+    def get_entities(*args, **kwargs):
+        adapters.append(dspy.settings.adapter)
+        return ["Harry", "Ginny"]
+
+    def get_relations(*args, **kwargs):
+        return [("Harry", "married", "Ginny")]
+
+    monkeypatch.setattr(kg_gen_module, "get_entities", get_entities)
+    monkeypatch.setattr(kg_gen_module, "get_relations", get_relations)
+    return adapters
+
+
+def test_generate_keeps_globally_configured_adapter(monkeypatch):
+    adapters = _record_adapter(monkeypatch)
+    adapter = dspy.JSONAdapter()
+    previous = dspy.settings.adapter
+    dspy.configure(adapter=adapter)
+    try:
+        graph = KGGen().generate("Harry married Ginny.", deduplication_method=None)
+    finally:
+        dspy.configure(adapter=previous)
+
+    assert adapters == [adapter]
+    assert graph.relations == {("Harry", "married", "Ginny")}
+
+
+def test_generate_json_mode_sets_adapter(monkeypatch):
+    adapters = _record_adapter(monkeypatch)
+    kg = KGGen(json_mode=True)
+
+    kg.generate("Harry married Ginny.", deduplication_method=None)
+
+    assert adapters == [kg.adapter]
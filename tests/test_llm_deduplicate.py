@@ -0,0 +1,155 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from src.kg_gen.models import Graph
+from src.kg_gen.utils.llm_deduplicate import LLMDeduplicate, _pre_cluster
+
+
+def test_pre_cluster_groups_case_and_whitespace_variants():
+    representatives, pre_clusters = _pre_cluster(
+        ["New  York", "new york", "New York", "Paris"]
+    )
+
+    assert sorted(representatives) == ["New York", "Paris"]
+    assert pre_clusters == {"New York": {"New  York", "new york", "New York"}}
+
+
+def test_pre_cluster_prefers_variants_that_are_not_all_caps():
+    representatives, pre_clusters = _pre_cluster(
+        ["PERSON", "Person", "person", "IN", "in"]
+    )
+
+    assert sorted(representatives) == ["Person", "in"]
+    assert pre_clusters == {
+        "Person": {"PERSON", "Person", "person"},
+        "in": {"IN", "in"},
+    }
+
+
+def test_pre_cluster_keeps_distinct_items():
+    representatives, pre_clusters = _pre_cluster(["apple", "apples", "Apple pie"])
+
+    assert sorted(representatives) == ["Apple pie", "apple", "apples"]
+    assert pre_clusters == {}
+
+
+def test_pre_cluster_groups_compatibility_variants():
+    representatives, pre_clusters = _pre_cluster(
+        ["eﬀort", "Effort", "Caﬀè", "Caffè", "ＭÜLLER", "müller"]
+    )
+
+    assert sorted(representatives) == ["Caffè", "Effort", "müller"]
+    assert pre_clusters == {
+        "Effort": {"eﬀort", "Effort"},
+        "Caffè": {"Caﬀè", "Caffè"},
+        "müller": {"ＭÜLLER", "müller"},
+    }
+
+
+ITEMS = [f"item {i}" for i in range(40)]
+
+
+class _Encoder:
+    def encode(self, texts, show_progress_bar=False):
+        return np.array([[len(text), 1.0] for text in texts])
+
+
+class _Result:
+    """LM result stub that records when deduplicate_cluster applies it."""
+
+    def __init__(self, item, applied):
+        self._item = item
+        self._applied = applied
+        rnd = random.Random(item)
+        self._duplicates = rnd.sample(ITEMS, 3) if rnd.random() < 0.4 else []
+        self.alias = item.upper() if self._duplicates else item
+
+    @property
+    def duplicates(self):
+        self._applied.append(self._item)
+        return self._duplicates
+
+
+def _deduplicator(item_concurrency, batch_items):
+    graph = Graph(entities=set(ITEMS), edges={"is"}, relations=set())
+    deduplicator = LLMDeduplicate(
+        _Encoder(),
+        None,
+        graph,
+        item_concurrency=item_concurrency,
+        batch_items=batch_items,
+    )
+    deduplicator.calls = []
+    deduplicator.applied = []
+
+    def find_duplicates(item, type="node", candidates=None):
+        # Random latency so concurrent calls complete out of order
+        time.sleep(random.random() / 500)
+        deduplicator.calls.append(item)
+        return [], _Result(item, deduplicator.applied)
+
+    def find_duplicates_batch(batch, type="node", candidates=None):
+        return [find_duplicates(item, type, candidates) for item in batch]
+
+    deduplicator._find_duplicates = find_duplicates
+    deduplicator._find_duplicates_batch = find_duplicates_batch
+    return deduplicator
+
+
+@pytest.mark.parametrize("batch_items", [False, True])
+@pytest.mark.parametrize("item_concurrency", [1, 3, 4, 7])
+def test_deduplicate_cluster_concurrent_matches_sequential(
+    item_concurrency, batch_items
+):
+    cluster = random.Random(0).sample(ITEMS, 30)
+    sequential = _deduplicator(1, False)
+    expected = sequential.deduplicate_cluster(cluster)
+
+    deduplicator = _deduplicator(item_concurrency, batch_items)
+
+    assert deduplicator.deduplicate_cluster(cluster) == expected
+    # Results are applied for the same items in the same order, so the ones
+    # absorbed as duplicates never have their (speculative) result applied
+    assert deduplicator.applied == sequential.applied
+    # The bottom item is last, with nothing left to compare it with
+    assert cluster[0] not in deduplicator.calls
+
+
+def test_deduplicate_cluster_skips_absorbed_and_last_items():
+    cluster = random.Random(0).sample(ITEMS, 30)
+    deduplicator = _deduplicator(1, False)
+
+    _, item_clusters = deduplicator.deduplicate_cluster(cluster)
+
+    # Sequentially, only the items whose result is applied get a call
+    assert deduplicator.calls == deduplicator.applied
+    absorbed = {
+        member for group in item_clusters.values() if len(group) > 1 for member in group
+    } - set(deduplicator.applied)
+    assert absorbed
+    # Apart from the absorbed duplicates, only the last item gets no call
+    (last,) = set(cluster) - set(deduplicator.calls) - absorbed
+    assert item_clusters[last] == {last}
+
+
+@pytest.mark.parametrize("batch_items", [False, True])
+def test_deduplicate_cluster_single_item_needs_no_call(batch_items):
+    deduplicator = _deduplicator(4, batch_items)
+
+    assert deduplicator.deduplicate_cluster(["item 0"]) == (
+        {"item 0"},
+        {"item 0": {"item 0"}},
+    )
+    assert deduplicator.calls == []
+
+
+def test_get_relevant_items_ties_do_not_depend_on_top_k():
+    deduplicator = _deduplicator(1, False)
+    ranking = deduplicator.get_relevant_items("item 1", top_k=len(ITEMS))
+
+    for top_k in range(1, len(ITEMS)):
+        top_items = deduplicator.get_relevant_items("item 1", top_k=top_k)
+        assert top_items == ranking[:top_k]
@@ -0,0 +1,74 @@
+from src.kg_gen.models import Graph
+from src.kg_gen.utils.neo4j_integration import Neo4jUploader, _sanitize_rel_type
+
+
+def test_sanitize_rel_type_separators():
+    assert _sanitize_rel_type("is part-of") == "IS_PART_OF"
+    assert _sanitize_rel_type("works at / for") == "WORKS_AT_FOR"
+    assert _sanitize_rel_type("  based in  ") == "BASED_IN"
+
+
+def test_sanitize_rel_type_drops_invalid_characters():
+    assert _sanitize_rel_type("father's (biological) son") == "FATHERS_BIOLOGICAL_SON"
+    assert _sanitize_rel_type('said "hello"') == "SAID_HELLO"
+    assert _sanitize_rel_type("`; DROP") == "DROP"
+
+
+def test_sanitize_rel_type_empty():
+    assert _sanitize_rel_type("!!!") == "RELATED_TO"
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.runs = []
+
+    def run(self, query, **parameters):
+        self.runs.append((query, parameters))
+
+
+def test_create_relationships_batches_per_type():
+    graph = Graph(
+        entities={"Harry", "Ginny", "Albus"},
+        relations={
+            ("Harry", "married", "Ginny"),
+            ("Harry", "father of", "Albus"),
+            ("Ginny", "father-of", "Albus"),
+        },
+        edges={"married", "father of", "father-of"},
+    )
+    session = _RecordingSession()
+
+    rel_count = Neo4jUploader("bolt://unused", "", "")._create_relationships(
+        session, graph
+    )
+
+    assert rel_count == 3
+    assert len(session.runs) == 2
+    rows = {
+        query.split("[r:`")[1].split("`]")[0]: params["rows"]
+        for query, params in session.runs
+    }
+    assert len(rows["MARRIED"]) == 1
+    assert {row["predicate"] for row in rows["FATHER_OF"]} == {"father of", "father-of"}
+
+
+def test_create_nodes_counts_entities():
+    class _Result:
+        consumed = False
+
+        def consume(self):
+            self.consumed = True
+
+    result = _Result()
+
+    class _Session:
+        def run(self, query, **parameters):
+            self.parameters = parameters
+            return result
+
+    session = _Session()
+    graph = Graph(entities={"Harry", "Ginny"}, relations=set(), edges=set())
+
+    assert Neo4jUploader("bolt://unused", "", "")._create_nodes(session, graph) == 2
+    assert sorted(session.parameters["entities"]) == ["Ginny", "Harry"]
+    assert result.consumed
@@ -0,0 +1,81 @@
+import time
+
+from src.kg_gen.steps._2_get_relations import _extract_json, parse_relations_response
+
+
+ENTITIES = ["Harry", "Ginny", "Albus"]
+
+
+def test_parse_plain_json():
+    raw = '{"relations": [{"subject": "Harry", "predicate": "married", "object": "Ginny"}]}'
+    assert parse_relations_response(raw, ENTITIES) == [("Harry", "married", "Ginny")]
+
+
+def test_parse_filters_unknown_entities():
+    raw = """[
+        {"subject": "Harry", "predicate": "father of", "object": "Albus"},
+        {"subject": "Harry", "predicate": "friend of", "object": "Ron"}
+    ]"""
+    assert parse_relations_response(raw, ENTITIES) == [("Harry", "father of", "Albus")]
+
+
+def test_parse_json_wrapped_in_text():
+    raw = """Here are the relations:
+```json
+{"relations": [{"subject": "Ginny", "predicate": "mother of", "object": "Albus"}]}
+```
+Let me know if you need anything else {}."""
+    assert parse_relations_response(raw, ENTITIES) == [("Ginny", "mother of", "Albus")]
+
+
+def test_parse_invalid_json():
+    assert parse_relations_response("no json here", ENTITIES) == []
+    assert parse_relations_response('{"relations": [', ENTITIES) == []
+
+
+def test_extract_json_ignores_braces_in_strings():
+    text = 'prefix {"a": "} not the end {", "b": [1, {"c": "\\"}"}]} suffix }'
+    assert _extract_json(text) == '{"a": "} not the end {", "b": [1, {"c": "\\"}"}]}'
+
+
+def test_extract_json_unbalanced():
+    assert _extract_json("{[}]") is None
+    assert _extract_json('{"a": 1') is None
+    assert _extract_json("nothing") is None
+
+
+def test_parse_json_after_prose_brackets():
+    payload = '{"relations": [{"subject": "Harry", "predicate": "married", "object": "Ginny"}]}'
+    expected = [("Harry", "married", "Ginny")]
+    assert (
+        parse_relations_response(f"Here are the relations [1]: {payload}", ENTITIES)
+        == expected
+    )
+    assert (
+        parse_relations_response(f"Result (see {{notes}}): {payload}", ENTITIES)
+        == expected
+    )
+
+
+def test_extract_json_skips_invalid_spans():
+    assert _extract_json('see {notes} then {"a": 1}') == '{"a": 1}'
+    assert _extract_json('{"a": [1} {"b": 2}') == '{"b": 2}'
+
+
+def test_parse_large_malformed_prose_is_linear():
+    payload = '{"relations": [{"subject": "Harry", "predicate": "married", "object": "Ginny"}]}'
+    # Unbalanced and invalid brackets, deep nesting and a stray quote
+    raw = (
+        "see [note {ref " * 20_000
+        + "[1, " * 5_000
+        + "[x" * 5_000
+        + "]" * 5_000
+        + 'he said "hi\n'
+        + payload
+    )
+
+    start = time.perf_counter()
+    relations = parse_relations_response(raw, ENTITIES)
+
+    assert relations == [("Harry", "married", "Ginny")]
+    assert time.perf_counter() - start < 2
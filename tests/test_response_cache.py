@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import litellm
+import pytest
+
+import src.kg_gen.utils.response_cache as response_cache
+from src.kg_gen.utils.response_cache import (
+    _request_key,
+    clear_response_cache,
+    parsed_response,
+    response_text,
+)
+
+
+class _FakeResponses:
+    """litellm.responses stand-in returning texts in turn, then "response N"."""
+
+    def __init__(self):
+        self.calls = []
+        self.texts = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        n = len(self.calls)
+        text = self.texts[n - 1] if n <= len(self.texts) else f"response {n}"
+        content = SimpleNamespace(text=text)
+        return SimpleNamespace(output=[SimpleNamespace(content=[content])])
+
+
+@pytest.fixture
+def responses(monkeypatch, tmp_path):
+    """Fake provider with an empty cache persisted in tmp_path."""
+    monkeypatch.setenv("KG_GEN_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("KG_GEN_NOCACHE", raising=False)
+    fake = _FakeResponses()
+    monkeypatch.setattr(litellm, "responses", fake)
+    clear_response_cache()
+    yield fake
+    clear_response_cache()
+
+
+def _request(text, api_key="key"):
+    return {
+        "model": "openai/gpt-4o",
+        "input": [{"role": "user", "content": text}],
+        "api_key": api_key,
+    }
+
+
+def test_identical_requests_are_cached(responses):
+    assert response_text(_request("a")) == "response 1"
+    assert response_text(_request("a", api_key="other")) == "response 1"
+    assert response_text(_request("b")) == "response 2"
+    assert len(responses.calls) == 2
+
+
+def test_cache_disabled(responses):
+    response_text(_request("a"), cache=False)
+    response_text(_request("a"), cache=False)
+    assert len(responses.calls) == 2
+
+
+def test_responses_persist_across_runs(responses):
+    assert response_text(_request("a")) == "response 1"
+    # A new process starts with an empty in-memory cache
+    clear_response_cache()
+    assert response_text(_request("a")) == "response 1"
+    assert len(responses.calls) == 1
+
+
+def test_nocache_env_bypasses_cache(responses, monkeypatch, tmp_path):
+    monkeypatch.setenv("KG_GEN_NOCACHE", "1")
+
+    response_text(_request("a"))
+    response_text(_request("a"))
+    assert len(responses.calls) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejected_responses_are_not_cached(responses, tmp_path):
+    responses.texts = ['{"entit', '{"a": 1}']
+
+    with pytest.raises(ValueError):
+        parsed_response(_request("a"), json.loads)
+    assert list(tmp_path.iterdir()) == []
+
+    assert parsed_response(_request("a"), json.loads) == {"a": 1}
+    assert parsed_response(_request("a"), json.loads) == {"a": 1}
+    assert len(responses.calls) == 2
+
+
+def test_poisoned_entry_is_replaced(responses, tmp_path):
+    responses.texts = ['{"a": 1}']
+    path = tmp_path / f"{_request_key(_request('a'))}.json"
+    path.write_text(json.dumps({"text": "I cannot help with that."}))
+
+    assert parsed_response(_request("a"), json.loads) == {"a": 1}
+    assert json.loads(path.read_text()) == {"text": '{"a": 1}'}
+    assert len(responses.calls) == 1
+
+
+def test_persistent_cache_is_pruned(responses, monkeypatch, tmp_path):
+    monkeypatch.setattr(response_cache, "_MAX_PERSISTENT_ENTRIES", 2)
+    monkeypatch.setattr(response_cache, "_PRUNE_EVERY", 1)
+
+    now = time.time()
+    for i, text in enumerate("abc"):
+        response_text(_request(text))
+        # Distinct modification times so the oldest entry is well defined
+        modified = now - 10 + i
+        os.utime(
+            tmp_path / f"{_request_key(_request(text))}.json", (modified, modified)
+        )
+
+    remaining = {path.name for path in tmp_path.iterdir()}
+    assert remaining == {f"{_request_key(_request(text))}.json" for text in "bc"}
+
+
+def test_concurrent_requests_respect_entry_limit(responses, monkeypatch):
+    monkeypatch.setattr(response_cache, "_MAX_ENTRIES", 8)
+    monkeypatch.setattr(response_cache, "_write_persistent", lambda key, text: None)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda i: response_text(_request(str(i % 50))), range(2000)))
+
+    assert len(response_cache._responses) <= 8